@@ -2,8 +2,11 @@
 Format agent results for display
 """
 
-import pandas as pd
 from datetime import datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class ResultsFormatter:
     """Format agent output for UI display"""
@@ -25,24 +28,37 @@ class ResultsFormatter:
 """
     
     @staticmethod
-    def format_sources(articles: list) -> pd.DataFrame:
+    def format_partial_summary(summary: str, query: str) -> str:
+        """Format an in-progress summary as markdown while it streams"""
+        return f"""## Summary for: "{query}"
+
+{summary}
+
+---
+
+**Status:** ⏳ Generating summary...
+"""
+    
+    @staticmethod
+    def format_sources(articles: list) -> "pd.DataFrame":
         """Format articles as dataframe for UI"""
-        data = []
+        import pandas as pd
+        
+        top = articles[:5]
         
-        for i, article in enumerate(articles[:5], 1):
-            credibility_score = article.get("credibility_score", 0)
-            stars = "⭐" * int(credibility_score) + "☆" * (5 - int(credibility_score))
-            
-            data.append({
-                "Rank": i,
-                "Title": article.get("title", "N/A")[:70] + "..." if len(article.get("title", "")) > 70 else article.get("title", "N/A"),
-                "Source": article.get("source", "Unknown"),
-                "Date": article.get("published_at", "N/A")[:10],
-                "Credibility": stars,
-                "URL": article.get("url", "N/A"),
-            })
+        # Build each column in one pass and construct the frame once
+        titles = [a.get("title") or "N/A" for a in top]
+        titles = [t[:70] + "..." if len(t) > 70 else t for t in titles]
+        scores = [min(int(a.get("credibility_score", 0)), 5) for a in top]
         
-        return pd.DataFrame(data)
+        return pd.DataFrame({
+            "Rank": range(1, len(top) + 1),
+            "Title": titles,
+            "Source": [a.get("source") or "Unknown" for a in top],
+            "Date": [(a.get("published_at") or "N/A")[:10] for a in top],
+            "Credibility": ["⭐" * s + "☆" * (5 - s) for s in scores],
+            "URL": [a.get("url") or "N/A" for a in top],
+        })
     
     @staticmethod
     def format_error_message(errors: list) -> str:
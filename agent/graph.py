@@ -7,42 +7,33 @@ from agent.state import AgentState
 from agent.nodes import plan_node, search_node, extract_node, analyze_node, summarize_node
 from agent.formatter import ResultsFormatter
 import time
+from functools import lru_cache
 
-def build_agent_graph(newsapi_key: str, groq_key: str, gnews_key: str = None, logger=None):
+AGENT_STEPS = ("plan", "search", "extract", "analyze", "summarize")
+
+def _make_node(node_fn, *args):
+    """Bind a node's API keys; the logger is read from state so compiled graphs can be shared"""
+    return lambda state: node_fn(state, *args, logger=state.get("logger"))
+
+@lru_cache(maxsize=8)
+def build_agent_graph(newsapi_key: str, groq_key: str, gnews_key: str = None):
     """
     Build the complete LangGraph workflow
     
     Flow: Plan → Search → Extract → Analyze → Summarize
+    
+    Compiled graphs are cached per key combination.
     """
     
     # Create graph
     graph = StateGraph(AgentState)
     
     # Add nodes
-    graph.add_node(
-        "plan",
-        lambda state: plan_node(state, logger=logger)
-    )
-    
-    graph.add_node(
-        "search",
-        lambda state: search_node(state, newsapi_key, gnews_key, logger=logger)
-    )
-    
-    graph.add_node(
-        "extract",
-        lambda state: extract_node(state, logger=logger)
-    )
-    
-    graph.add_node(
-        "analyze",
-        lambda state: analyze_node(state, logger=logger)
-    )
-    
-    graph.add_node(
-        "summarize",
-        lambda state: summarize_node(state, groq_key, logger=logger)
-    )
+    graph.add_node("plan", _make_node(plan_node))
+    graph.add_node("search", _make_node(search_node, newsapi_key, gnews_key))
+    graph.add_node("extract", _make_node(extract_node))
+    graph.add_node("analyze", _make_node(analyze_node))
+    graph.add_node("summarize", _make_node(summarize_node, groq_key))
     
     # Define edges 
     graph.add_edge("plan", "search")
@@ -56,15 +47,19 @@ def build_agent_graph(newsapi_key: str, groq_key: str, gnews_key: str = None, lo
     
     return graph.compile()
 
-def execute_agent(query: str, newsapi_key: str, groq_key: str, gnews_key: str = None, logger=None):
+def stream_agent(query: str, newsapi_key: str, groq_key: str, gnews_key: str = None, logger=None):
     """
-    Execute the agent and return formatted results
+    Execute the agent, streaming the summary as the LLM generates it
+    
+    Yields {"done": False, "step": ...} as each node finishes and
+    {"done": False, "summary": ...} with the partial summary markdown,
+    then a final result dict (same shape as execute_agent) with "done": True.
     """
     start_time = time.time()
     
     try:
         # Build graph
-        agent_graph = build_agent_graph(newsapi_key, groq_key, gnews_key, logger=logger)
+        agent_graph = build_agent_graph(newsapi_key, groq_key, gnews_key)
         
         # Initialize state
         initial_state = {
@@ -78,10 +73,32 @@ def execute_agent(query: str, newsapi_key: str, groq_key: str, gnews_key: str =
             "sources_dataframe": None,
             "processing_time": 0,
             "errors": [],
-            "agent_log": []
+            "agent_log": [],
+            "logger": logger
         }
         
-        result = agent_graph.invoke(initial_state)
+        result = initial_state
+        partial_summary = ""
+        
+        for mode, chunk in agent_graph.stream(initial_state, stream_mode=["messages", "updates", "values"]):
+            if mode == "values":
+                result = chunk
+                continue
+            
+            if mode == "updates":
+                # One update per finished node, for progress reporting
+                for step in chunk:
+                    yield {"done": False, "step": step}
+                continue
+            
+            # LLM token chunks from the summarize node
+            message, metadata = chunk
+            if metadata.get("langgraph_node") == "summarize" and message.content:
+                partial_summary += message.content
+                yield {
+                    "done": False,
+                    "summary": ResultsFormatter.format_partial_summary(partial_summary, query)
+                }
         
         # Calculate processing time
         processing_time = time.time() - start_time
@@ -95,7 +112,8 @@ def execute_agent(query: str, newsapi_key: str, groq_key: str, gnews_key: str =
         
         sources_df = ResultsFormatter.format_sources(result["analyzed_articles"])
         
-        return {
+        yield {
+            "done": True,
             "success": True,
             "summary": summary_md,
             "sources": sources_df,
@@ -109,7 +127,8 @@ def execute_agent(query: str, newsapi_key: str, groq_key: str, gnews_key: str =
         if logger:
             logger.error(f"Agent execution failed: {e}")
         
-        return {
+        yield {
+            "done": True,
             "success": False,
             "summary": f"❌ Agent failed: {str(e)}",
             "sources": None,
@@ -117,3 +136,11 @@ def execute_agent(query: str, newsapi_key: str, groq_key: str, gnews_key: str =
             "errors": [str(e)],
             "agent_log": []
         }
+
+def execute_agent(query: str, newsapi_key: str, groq_key: str, gnews_key: str = None, logger=None):
+    """
+    Execute the agent and return formatted results
+    """
+    for update in stream_agent(query, newsapi_key, groq_key, gnews_key, logger=logger):
+        if update["done"]:
+            return update
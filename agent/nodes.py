@@ -3,10 +3,19 @@ LangGraph Node Definitions
 Each node is a step in the agent workflow
 """
 
+import io
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from agent.state import AgentState
-from agent.tools import NewSearchTool, ContentExtractorTool, SourceAnalyzerTool
-from config import MAX_RESULTS, SEARCH_QUERY_VARIANTS
+from agent.tools import NewSearchTool, ContentExtractorTool, SourceAnalyzerTool, DuplicateFilterTool, _dedupe_by_url
+from config import MAX_RESULTS, SEARCH_QUERY_VARIANTS, MAX_CONTENT_CHARS
+from utils import debug
+
+# Intent keywords, matched as whole words so e.g. "nowhere" isn't breaking news
+_BREAKING_RE = re.compile(r"\b(?:latest|today|now|breaking|just happened)\b")
+_ANALYSIS_RE = re.compile(r"\b(?:trends?|analysis|why|how|impact)\b")
 
 def plan_node(state: AgentState, logger=None) -> AgentState:
     """PLAN NODE: Analyze query and generate search strategies"""
@@ -15,9 +24,9 @@ def plan_node(state: AgentState, logger=None) -> AgentState:
     intent = "general"
     query_lower = query.lower()
     
-    if any(x in query_lower for x in ["latest", "today", "now", "breaking", "just happened"]):
+    if _BREAKING_RE.search(query_lower):
         intent = "breaking_news"
-    elif any(x in query_lower for x in ["trend", "analysis", "why", "how", "impact"]):
+    elif _ANALYSIS_RE.search(query_lower):
         intent = "analysis"
     
     # Generate query variations
@@ -27,20 +36,20 @@ def plan_node(state: AgentState, logger=None) -> AgentState:
         " ".join(query.split()[:3])  # Simplified
     ]
     
-    state["agent_log"].append({
+    log_entry = {
         "step": "plan",
         "intent": intent,
         "query_variations": variations,
         "timestamp": time.time()
-    })
+    }
     
     if logger:
         logger.info(f"Plan: intent={intent}, variations={len(variations)}")
     
     return {
-        **state,
         "intent": intent,
-        "search_queries": variations
+        "search_queries": variations,
+        "agent_log": [log_entry]
     }
 
 
@@ -49,127 +58,152 @@ def search_node(state: AgentState, newsapi_key: str, gnews_key: str = None, logg
     try:
         search_tool = NewSearchTool(newsapi_key, gnews_key)
         
-        primary_query = state["search_queries"][0]
-        articles = search_tool.search(primary_query, max_results=MAX_RESULTS)
+        # Run every query variation concurrently; drop repeats (short queries collapse)
+        queries = list(dict.fromkeys(state["search_queries"]))
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            futures = [
+                executor.submit(search_tool.search, q, max_results=MAX_RESULTS)
+                for q in queries
+            ]
+            results = []
+            for future in futures:
+                results.extend(future.result())
         
-        if not articles:
-            state["errors"].append("No articles found from any API")
+        articles = _dedupe_by_url(results)
         
-        state["agent_log"].append({
+        errors = [] if articles else ["No articles found from any API"]
+        
+        log_entry = {
             "step": "search",
-            "query": primary_query,
+            "queries": queries,
             "articles_found": len(articles),
             "timestamp": time.time()
-        })
+        }
         
         if logger:
             logger.info(f"Search: found {len(articles)} articles")
         
         return {
-            **state,
-            "raw_articles": articles
+            "raw_articles": articles,
+            "errors": errors,
+            "agent_log": [log_entry]
         }
     
     except Exception as e:
-        state["errors"].append(f"Search failed: {str(e)}")
         if logger:
             logger.error(f"Search error: {e}")
-        return state
+        return {"errors": [f"Search failed: {str(e)}"]}
 
 
 def extract_node(state: AgentState, logger=None) -> AgentState:
     """EXTRACT NODE: Extract full content from article URLs"""
     try:
         if not state["raw_articles"]:
-            state["errors"].append("No articles to extract")
-            return state
+            return {"errors": ["No articles to extract"]}
         
         extractor = ContentExtractorTool()
         extracted = extractor.extract(state["raw_articles"])
         
         success_count = sum(1 for a in extracted if a.get("extraction_success", False))
         
-        state["agent_log"].append({
+        log_entry = {
             "step": "extract",
             "total_articles": len(extracted),
             "successful": success_count,
             "timestamp": time.time()
-        })
+        }
         
         if logger:
             logger.info(f"Extract: {success_count}/{len(extracted)} successful")
+        debug(logger, lambda: "Extract content lengths: " + ", ".join(
+            f"{a.get('source', 'Unknown')}={len(a.get('full_content') or '')}" for a in extracted
+        ))
         
         return {
-            **state,
-            "extracted_articles": extracted
+            "extracted_articles": extracted,
+            "agent_log": [log_entry]
         }
     
     except Exception as e:
-        state["errors"].append(f"Extraction failed: {str(e)}")
         if logger:
             logger.error(f"Extract error: {e}")
-        return state
+        return {"errors": [f"Extraction failed: {str(e)}"]}
 
 
 def analyze_node(state: AgentState, logger=None) -> AgentState:
     """ANALYZE NODE: Score sources by credibility"""
     try:
         if not state["extracted_articles"]:
-            state["errors"].append("No articles to analyze")
-            return state
+            return {"errors": ["No articles to analyze"]}
         
         analyzer = SourceAnalyzerTool()
         analyzed = analyzer.analyze(state["extracted_articles"])
         
-        # Sort by credibility
+        # Sort by credibility, then cap so the best articles across all query variations survive
         ranked = sorted(analyzed, key=lambda a: a.get("credibility_score", 0), reverse=True)
         
-        state["agent_log"].append({
+        # Drop near-duplicates, keeping the most credible copy
+        unique = DuplicateFilterTool().filter(ranked)
+        
+        # Scoring and dedup saw the full text; only the summary context needs the trimmed version
+        ranked = [
+            {**a, "full_content": (a.get("full_content") or "")[:MAX_CONTENT_CHARS]}
+            for a in unique[:MAX_RESULTS]
+        ]
+        
+        log_entry = {
             "step": "analyze",
             "articles_analyzed": len(analyzed),
+            "duplicates_removed": len(analyzed) - len(unique),
             "top_credibility": ranked[0].get("credibility_score", 0) if ranked else 0,
             "timestamp": time.time()
-        })
+        }
         
         if logger:
             logger.info(f"Analyze: scored {len(analyzed)} articles")
         
         return {
-            **state,
-            "analyzed_articles": ranked
+            "analyzed_articles": ranked,
+            "agent_log": [log_entry]
         }
     
     except Exception as e:
-        state["errors"].append(f"Analysis failed: {str(e)}")
         if logger:
             logger.error(f"Analyze error: {e}")
-        return state
+        return {"errors": [f"Analysis failed: {str(e)}"]}
+
+
+@lru_cache(maxsize=4)
+def _get_llm(groq_key: str):
+    """Return a ChatGroq client for this key, reused across requests to keep its connection warm"""
+    from langchain_groq import ChatGroq
+    from config import GROQ_MODEL, LLM_MAX_TOKENS, LLM_TEMPERATURE
+    
+    return ChatGroq(
+        model=GROQ_MODEL,
+        groq_api_key=groq_key,
+        temperature=LLM_TEMPERATURE,
+        max_tokens=LLM_MAX_TOKENS
+    )
 
 
 def summarize_node(state: AgentState, groq_key: str, logger=None) -> AgentState:
     """SUMMARIZE NODE: Generate AI summary using Groq LLM"""
     try:
         if not state["analyzed_articles"]:
-            state["errors"].append("No articles to summarize")
-            return state
-        
-        from langchain_groq import ChatGroq
-        from config import GROQ_MODEL, LLM_MAX_TOKENS, LLM_TEMPERATURE
+            return {"errors": ["No articles to summarize"]}
         
-        llm = ChatGroq(
-            model=GROQ_MODEL,
-            groq_api_key=groq_key,
-            temperature=LLM_TEMPERATURE,
-            max_tokens=LLM_MAX_TOKENS
-        )
+        llm = _get_llm(groq_key)
         
         # context
-        articles_context = "\n\n".join([
-            f"[Source: {a.get('source', 'Unknown')} - {a.get('credibility_tier', 'unknown')}]\n"
-            f"Title: {a.get('title', 'N/A')}\n"
-            f"Content: {a.get('full_content', a.get('description', ''))[:800]}"
-            for a in state["analyzed_articles"][:5]
-        ])
+        context = io.StringIO()
+        for i, a in enumerate(state["analyzed_articles"][:5]):
+            if i:
+                context.write("\n\n")
+            context.write(f"[Source: {a.get('source', 'Unknown')} - {a.get('credibility_tier', 'unknown')}]\n")
+            context.write(f"Title: {a.get('title', 'N/A')}\n")
+            context.write(f"Content: {(a.get('full_content') or a.get('description') or '')[:800]}")
+        articles_context = context.getvalue()
         
         prompt = f"""You are an expert news analyst. Synthesize the following articles about "{state['query']}" into a comprehensive, 300-500 word summary.
 
@@ -189,25 +223,24 @@ REQUIREMENTS:
 
 SUMMARY:"""
         
-        response = llm.invoke(prompt)
-        summary = response.content
+        # Stream tokens so graph.stream(stream_mode="messages") can surface them as they arrive
+        summary = "".join(chunk.content for chunk in llm.stream(prompt))
         
-        state["agent_log"].append({
+        log_entry = {
             "step": "summarize",
             "summary_length": len(summary),
             "timestamp": time.time()
-        })
+        }
         
         if logger:
             logger.info(f"Summarize: generated {len(summary)} char summary")
         
         return {
-            **state,
-            "summary": summary
+            "summary": summary,
+            "agent_log": [log_entry]
         }
     
     except Exception as e:
-        state["errors"].append(f"Summarization failed: {str(e)}")
         if logger:
             logger.error(f"Summarize error: {e}")
-        return state
+        return {"errors": [f"Summarization failed: {str(e)}"]}
@@ -2,9 +2,9 @@
 LangGraph Agent State Definition
 Defines the complete state passed between nodes
 """
-from typing import TypedDict, Annotated, Optional
+from typing import TypedDict, Annotated, Optional, Any
 import operator
-import pandas as pd
+import logging
 
 class AgentState(TypedDict):
     """Complete state for the news aggregation agent"""
@@ -23,8 +23,9 @@ class AgentState(TypedDict):
     analyzed_articles: list  # Articles with credibility scores
     
     summary: str  # Final AI summary
-    sources_dataframe: Optional[pd.DataFrame]  # Formatted sources table
+    sources_dataframe: Optional[Any]  # Formatted sources table (pandas DataFrame)
     
     processing_time: float  # Total execution time
     errors: Annotated[list, operator.add]  # Error log (accumulates)
-    agent_log: list  # Step-by-step execution log
+    agent_log: Annotated[list, operator.add]  # Step-by-step execution log (accumulates)
+    logger: Optional[logging.Logger]  # Per-run logger (kept out of the cached graph)
@@ -2,10 +2,166 @@
 LangGraph tools for the agent
 """
 
+import hashlib
+import re
+import ahocorasick
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
-from config import SEARCH_TIMEOUT, EXTRACT_TIMEOUT, NEWS_API_BASE, GNEWS_API_BASE
+from requests.adapters import HTTPAdapter
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from config import (
+    SEARCH_TIMEOUT, EXTRACT_TIMEOUT, EXTRACT_CONNECT_TIMEOUT, NEWS_API_BASE, GNEWS_API_BASE,
+    MAX_FETCHES_PER_HOST
+)
+
+# pandas/numpy/rapidfuzz load on first analysis rather than when the graph is imported
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Shared keep-alive session so repeat requests to a host skip the TCP/TLS handshake
+_HTTP = requests.Session()
+_HTTP.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+_HTTP.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+_HTTP.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0',
+    'Connection': 'keep-alive'
+})
+
+# Evidence phrases scanned in one case-insensitive pass over the article body
+_EVIDENCE_RE = re.compile(r"\b(?:according to|said|research|data|study)\b", re.IGNORECASE)
+
+# Query params stripped during URL canonicalization (plus any utm_*)
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "ref", "ref_src", "_ga"}
+
+# Per-host fetch slots so a cluster of articles from one site doesn't hammer it;
+# each entry is [semaphore, users] and is dropped once no fetch is using it
+_HOST_SLOTS = {}
+_HOST_SLOTS_LOCK = threading.Lock()
+
+# LRU cache of extraction results keyed by canonical URL
+_EXTRACT_CACHE = OrderedDict()
+_EXTRACT_CACHE_SIZE = 512
+_EXTRACT_CACHE_LOCK = threading.Lock()
+
+
+def _canonicalize(url: str) -> str:
+    """Normalize a URL for dedup: lowercase host, drop fragment and tracking params"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        # Malformed URL (e.g. unbalanced IPv6 brackets): use it verbatim as its own key
+        return url
+    
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ]
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ""))
+
+
+def _dedupe_by_url(articles: list) -> list:
+    """Drop articles whose canonical URL has already been seen, keeping the first"""
+    unique = {}
+    for article in articles:
+        url = article.get("url", "")
+        if not url:
+            continue
+        key = _canonicalize(url)
+        if key not in unique:
+            unique[key] = article
+    
+    return list(unique.values())
+
+
+@contextmanager
+def _host_slot(host: str, deadline: float):
+    """Hold one of the host's fetch slots, giving up if none frees before the deadline"""
+    with _HOST_SLOTS_LOCK:
+        entry = _HOST_SLOTS.setdefault(host, [threading.Semaphore(MAX_FETCHES_PER_HOST), 0])
+        entry[1] += 1
+    
+    try:
+        if not entry[0].acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise TimeoutError(f"No fetch slot for {host} before the deadline")
+        try:
+            yield
+        finally:
+            entry[0].release()
+    finally:
+        with _HOST_SLOTS_LOCK:
+            entry[1] -= 1
+            if not entry[1]:
+                del _HOST_SLOTS[host]
+
+
+def _fetch_and_extract(url: str, timeout: int, cache_key: str, deadline: float) -> tuple:
+    """
+    Return (text, published_at) for a URL, cached under cache_key
+    
+    The real URL is always what gets fetched; cache_key (its canonical form)
+    lets tracking-param variants share an entry. Failures raise and are not cached.
+    """
+    with _EXTRACT_CACHE_LOCK:
+        if cache_key in _EXTRACT_CACHE:
+            _EXTRACT_CACHE.move_to_end(cache_key)
+            return _EXTRACT_CACHE[cache_key]
+    
+    result = _download_and_extract(url, timeout, deadline)
+    
+    with _EXTRACT_CACHE_LOCK:
+        _EXTRACT_CACHE[cache_key] = result
+        _EXTRACT_CACHE.move_to_end(cache_key)
+        if len(_EXTRACT_CACHE) > _EXTRACT_CACHE_SIZE:
+            _EXTRACT_CACHE.popitem(last=False)
+    
+    return result
+
+
+def _download_and_extract(url: str, timeout: int, deadline: float) -> tuple:
+    """Download a URL and extract its body text and publish date"""
+    import trafilatura
+    
+    # Streaming lets a fetch abandoned at the deadline hand its slot back after one read
+    with _host_slot(urlsplit(url).netloc, deadline):
+        with _HTTP.get(url, timeout=(EXTRACT_CONNECT_TIMEOUT, timeout), stream=True) as resp:
+            resp.raise_for_status()
+            body = bytearray()
+            for block in resp.iter_content(64 * 1024):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Download of {url} passed the deadline")
+                body += block
+    
+    # One parse yields both the body text and the page metadata
+    document = trafilatura.bare_extraction(
+        bytes(body),
+        favor_precision=True,
+        include_comments=False,
+        include_tables=False,
+        with_metadata=True
+    )
+    text = (document.text if document else None) or ""
+    published_at = document.date if document else None
+    
+    return text, published_at
+
+
+def _build_tier_automaton(tiers: dict) -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton mapping each tier token to its highest tier score"""
+    automaton = ahocorasick.Automaton()
+    for score, tokens in tiers.items():
+        for token in tokens:
+            best = max(score, automaton.get(token)) if automaton.exists(token) else score
+            automaton.add_word(token, best)
+    automaton.make_automaton()
+    
+    return automaton
+
 
 class NewSearchTool:
     """Search for news articles from multiple APIs"""
@@ -16,10 +172,25 @@ class NewSearchTool:
     
     def search(self, query: str, max_results: int = 5) -> list:
         """Search articles from NewsAPI and GNews"""
+        # Both providers are independent, so query them in parallel
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(self._fetch_newsapi, query, max_results)]
+            if self.gnews_key:
+                futures.append(executor.submit(self._fetch_gnews, query, max_results))
+            
+            # Collect in submission order so NewsAPI results keep priority
+            articles = []
+            for future in futures:
+                articles.extend(future.result())
+        
+        return _dedupe_by_url(articles)[:max_results]
+    
+    def _fetch_newsapi(self, query: str, max_results: int) -> list:
+        """Fetch articles from NewsAPI"""
         articles = []
         
         try:
-            resp = requests.get(
+            resp = _HTTP.get(
                 f"{NEWS_API_BASE}/everything",
                 params={
                     "q": query,
@@ -45,42 +216,39 @@ class NewSearchTool:
         except Exception as e:
             print(f"NewsAPI error: {e}")
         
-        # GNews fallback
-        if self.gnews_key and len(articles) < max_results:
-            try:
-                resp = requests.get(
-                    f"{GNEWS_API_BASE}/search",
-                    params={
-                        "q": query,
-                        "lang": "en",
-                        "max": max_results,
-                        "token": self.gnews_key
-                    },
-                    timeout=SEARCH_TIMEOUT
-                )
-                resp.raise_for_status()
-                for a in resp.json().get("articles", []):
-                    articles.append({
-                        "title": a.get("title"),
-                        "source": a.get("source", {}).get("name", "Unknown"),
-                        "url": a.get("url"),
-                        "image": a.get("image"),
-                        "description": a.get("description"),
-                        "published_at": a.get("publishedAt"),
-                        "content": a.get("content"),
-                        "api_source": "gnews"
-                    })
-            except Exception as e:
-                print(f"GNews error: {e}")
-        
-        # Deduplicate by URL
-        unique = {}
-        for article in articles:
-            url = article.get("url", "")
-            if url and url not in unique:
-                unique[url] = article
+        return articles
+    
+    def _fetch_gnews(self, query: str, max_results: int) -> list:
+        """Fetch articles from GNews"""
+        articles = []
         
-        return list(unique.values())[:max_results]
+        try:
+            resp = _HTTP.get(
+                f"{GNEWS_API_BASE}/search",
+                params={
+                    "q": query,
+                    "lang": "en",
+                    "max": max_results,
+                    "token": self.gnews_key
+                },
+                timeout=SEARCH_TIMEOUT
+            )
+            resp.raise_for_status()
+            for a in resp.json().get("articles", []):
+                articles.append({
+                    "title": a.get("title"),
+                    "source": a.get("source", {}).get("name", "Unknown"),
+                    "url": a.get("url"),
+                    "image": a.get("image"),
+                    "description": a.get("description"),
+                    "published_at": a.get("publishedAt"),
+                    "content": a.get("content"),
+                    "api_source": "gnews"
+                })
+        except Exception as e:
+            print(f"GNews error: {e}")
+        
+        return articles
 
 
 class ContentExtractorTool:
@@ -88,61 +256,57 @@ class ContentExtractorTool:
     
     def __init__(self, timeout: int = EXTRACT_TIMEOUT):
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0'
-        })
     
     def extract(self, articles: list) -> list:
         """Extract content from all articles"""
-        extracted = []
+        if not articles:
+            return []
         
-        for article in articles:
-            try:
-                url = article.get("url")
-                if not url:
-                    article["full_content"] = article.get("description", "")
-                    extracted.append(article)
-                    continue
-                
-                resp = self.session.get(url, timeout=self.timeout)
-                resp.raise_for_status()
-                
-                soup = BeautifulSoup(resp.content, 'html.parser')
-                
-                # Remove noise
-                for tag in soup(['script', 'style', 'nav', 'footer', 'ads']):
-                    tag.decompose()
-                
-                # Extract body
-                text = ""
-                selectors = [
-                    'article', '[role="main"]', '.article-content',
-                    '.post-content', '.entry-content', 'main'
-                ]
-                
-                for selector in selectors:
-                    element = soup.select_one(selector)
-                    if element:
-                        text = element.get_text(separator='\n', strip=True)
-                        if len(text) > 100:
-                            break
-                
-                # Fallback: all paragraphs
-                if not text or len(text) < 100:
-                    paragraphs = soup.find_all('p')
-                    text = '\n'.join([p.get_text(strip=True) for p in paragraphs[:10]])
-                
-                article["full_content"] = text if len(text) > 100 else article.get("description", "")
-                article["extraction_success"] = True
-                
-            except Exception as e:
+        # Fetches are I/O-bound, so run them concurrently under one overall deadline
+        executor = ThreadPoolExecutor(max_workers=len(articles))
+        deadline = time.monotonic() + self.timeout * 1.5
+        futures = [executor.submit(self._extract_one, article, deadline) for article in articles]
+        wait(futures, timeout=deadline - time.monotonic())
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        # Results stay in input order; anything past the deadline falls back to its description
+        return [
+            future.result() if future.done() else self._fallback(article)
+            for article, future in zip(articles, futures)
+        ]
+    
+    def _extract_one(self, article: dict, deadline: float) -> dict:
+        """Extract content from a single article"""
+        # Work on a copy so a fetch that outlives the deadline can't mutate the returned article
+        article = dict(article)
+        
+        try:
+            url = article.get("url")
+            if not url:
                 article["full_content"] = article.get("description", "")
-                article["extraction_success"] = False
+                return article
             
-            extracted.append(article)
+            # Canonical URL keys the cache, so tracking-param variants share one entry
+            text, published_at = _fetch_and_extract(url, self.timeout, _canonicalize(url), deadline)
+            
+            article["full_content"] = text if len(text) > 100 else article.get("description", "")
+            if not article.get("published_at") and published_at:
+                article["published_at"] = published_at
+            article["extraction_success"] = True
+            
+        except Exception as e:
+            return self._fallback(article)
         
-        return extracted
+        return article
+    
+    @staticmethod
+    def _fallback(article: dict) -> dict:
+        """Return a copy of the article using its description as content"""
+        return {
+            **article,
+            "full_content": article.get("description", ""),
+            "extraction_success": False
+        }
 
 
 class SourceAnalyzerTool:
@@ -152,80 +316,149 @@ class SourceAnalyzerTool:
     TIER_2 = {"nytimes", "washingtonpost", "economist"}
     TIER_3 = {"techcrunch", "arstechnica", "wired"}
     
+    _TIER_AUTOMATON = _build_tier_automaton({5.0: TIER_1, 4.0: TIER_2, 3.5: TIER_3})
+    
     def analyze(self, articles: list) -> list:
-        """Score articles by credibility"""
-        analyzed = []
+        """Score articles by credibility (vectorized over all articles at once)"""
+        if not articles:
+            return []
+        
+        import numpy as np
+        import pandas as pd
+        
+        df = pd.DataFrame(articles)
+        
+        # Publication tier (40%)
+        pub_score = self._score_publication(self._column(df, "source", "Unknown").str.lower())
+        
+        # Recency (20%)
+        recency_score = self._score_recency(self._column(df, "published_at", None))
+        
+        # Content quality (40%)
+        quality_score = self._score_content(self._column(df, "full_content", ""))
+        
+        # Weighted average
+        total_score = (pub_score * 0.4 + recency_score * 0.2 + quality_score * 0.4)
+        
+        credibility_scores = np.minimum(total_score, 5.0)
+        credibility_tiers = self._get_tier(total_score)
+        
+        for article, score, tier in zip(articles, credibility_scores, credibility_tiers):
+            article["credibility_score"] = float(score)
+            article["credibility_tier"] = str(tier)
+        
+        return list(articles)
+    
+    @staticmethod
+    def _column(df: "pd.DataFrame", name: str, default) -> "pd.Series":
+        """Return a column with missing values (or a missing column) set to default"""
+        import pandas as pd
+        
+        if name not in df:
+            return pd.Series(default, index=df.index, dtype=object)
+        return df[name].where(df[name].notna(), default)
+    
+    def _score_publication(self, source: "pd.Series") -> "np.ndarray":
+        # One automaton pass per source finds every tier token; the best tier wins
+        return source.map(
+            lambda s: max((score for _, score in self._TIER_AUTOMATON.iter(s)), default=2.0)
+        ).to_numpy(dtype=float)
+    
+    def _score_recency(self, published_at: "pd.Series") -> "np.ndarray":
+        import numpy as np
+        import pandas as pd
+        
+        pub_date = pd.to_datetime(published_at, errors="coerce", utc=True, format="ISO8601")
+        age_days = (pd.Timestamp.now(tz="UTC") - pub_date).dt.days
+        
+        # Unparseable dates give NaN ages, which fail every comparison and fall to the default
+        return np.select(
+            [age_days < 1, age_days < 7, age_days < 30, age_days.notna()],
+            [5.0, 4.5, 4.0, 2.0],
+            default=3.0
+        )
+    
+    def _score_content(self, content: "pd.Series") -> "np.ndarray":
+        import numpy as np
+        
+        content = content.astype(str)
+        evidence_count = content.str.count(_EVIDENCE_RE)
+        
+        return np.select(
+            [content.str.len() < 100, evidence_count > 3, evidence_count > 0],
+            [1.0, 4.5, 3.5],
+            default=2.5
+        )
+    
+    def _get_tier(self, score: "np.ndarray") -> "np.ndarray":
+        import numpy as np
+        
+        return np.select(
+            [score >= 4.5, score >= 3.5, score >= 2.5],
+            ["highly_credible", "credible", "moderately_credible"],
+            default="low_credibility"
+        )
+
+
+class DuplicateFilterTool:
+    """Drop near-duplicate articles (e.g. syndicated wire stories)"""
+    
+    TITLE_SIMILARITY = 85  # rapidfuzz token_set_ratio above which an article is a duplicate candidate
+    CONTENT_OVERLAP = 0.6  # Fraction of shared content chunks above which bodies match
+    CHUNK_MODULUS = 4  # A line whose hash is 0 mod this ends a content chunk (articles run to tens of paragraph lines)
+    
+    def filter(self, articles: list) -> list:
+        """Keep the first of each group of near-duplicates; articles should be ranked best-first"""
+        from rapidfuzz import fuzz
+        
+        kept = []
+        kept_chunks = []
         
         for article in articles:
-            source = article.get("source", "Unknown").lower()
-            
-            # Publication tier (40%)
-            pub_score = self._score_publication(source)
+            title = article.get("title") or ""
+            chunks = self._content_chunks(article.get("full_content") or "")
             
-            # Recency (20%)
-            recency_score = self._score_recency(article.get("published_at"))
+            if any(
+                self._is_duplicate(fuzz.token_set_ratio, title, chunks, k, k_chunks)
+                for k, k_chunks in zip(kept, kept_chunks)
+            ):
+                continue
             
-            # Content quality (40%)
-            quality_score = self._score_content(article.get("full_content", ""))
-            
-            # Weighted average
-            total_score = (pub_score * 0.4 + recency_score * 0.2 + quality_score * 0.4)
-            
-            article["credibility_score"] = min(total_score, 5.0)
-            article["credibility_tier"] = self._get_tier(total_score)
+            kept.append(article)
+            kept_chunks.append(chunks)
+        
+        return kept
+    
+    def _is_duplicate(self, title_ratio, title: str, chunks: set, kept: dict, kept_chunks: set) -> bool:
+        # Similar titles only make an article a candidate; shared body chunks must confirm it
+        if not title or not chunks:
+            return False
+        if title_ratio(title, kept.get("title") or "") <= self.TITLE_SIMILARITY:
+            return False
+        return len(chunks & kept_chunks) / len(chunks) > self.CONTENT_OVERLAP
+    
+    def _content_chunks(self, content: str) -> set:
+        """Hash variable-length chunks whose boundaries are chosen by line content"""
+        chunks = set()
+        chunk = hashlib.blake2b(digest_size=8)
+        empty = True
+        
+        for line in content.splitlines():
+            line = line.strip()
+            if not line:
+                continue
             
-            analyzed.append(article)
-        
-        return analyzed
-    
-    def _score_publication(self, source: str) -> float:
-        for t1 in self.TIER_1:
-            if t1 in source:
-                return 5.0
-        for t2 in self.TIER_2:
-            if t2 in source:
-                return 4.0
-        for t3 in self.TIER_3:
-            if t3 in source:
-                return 3.5
-        return 2.0
-    
-    def _score_recency(self, published_at: str) -> float:
-        try:
-            pub_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-            age_days = (datetime.now(pub_date.tzinfo) - pub_date).days
+            chunk.update(line.encode())
+            empty = False
             
-            if age_days < 1:
-                return 5.0
-            elif age_days < 7:
-                return 4.5
-            elif age_days < 30:
-                return 4.0
-            else:
-                return 2.0
-        except:
-            return 3.0
-    
-    def _score_content(self, content: str) -> float:
-        if not content or len(content) < 100:
-            return 1.0
-        
-        evidence_phrases = ["according to", "said", "research", "data", "study"]
-        evidence_count = sum(content.lower().count(p) for p in evidence_phrases)
-        
-        if evidence_count > 3:
-            return 4.5
-        elif evidence_count > 0:
-            return 3.5
-        else:
-            return 2.5
-    
-    def _get_tier(self, score: float) -> str:
-        if score >= 4.5:
-            return "highly_credible"
-        elif score >= 3.5:
-            return "credible"
-        elif score >= 2.5:
-            return "moderately_credible"
-        else:
-            return "low_credibility"
+            # Content-defined boundary: stable under insertions elsewhere in the article
+            line_hash = int.from_bytes(hashlib.blake2b(line.encode(), digest_size=8).digest(), "big")
+            if line_hash % self.CHUNK_MODULUS == 0:
+                chunks.add(chunk.digest())
+                chunk = hashlib.blake2b(digest_size=8)
+                empty = True
+        
+        if not empty:
+            chunks.add(chunk.digest())
+        
+        return chunks
@@ -2,9 +2,9 @@ import gradio as gr
 import pandas as pd
 import tempfile
 from datetime import date
-from utils import get_api_keys, validate_query, setup_logger
-from agent.graph import execute_agent
-from config import GRADIO_PORT, GRADIO_SHARE, GRADIO_THEME
+from utils import get_api_keys, validate_query, setup_logger, flush_logger
+from agent.graph import stream_agent, AGENT_STEPS
+from config import GRADIO_PORT, GRADIO_SHARE, GRADIO_THEME, MAX_QUERY_LEN
 
 news_key, groq_key, gnews_key = get_api_keys()
 
@@ -23,13 +23,15 @@ def save_api_keys(news_key: str, groq_key: str, gnews_key: str = ""):
     api_keys_store["gnews"] = gnews_key
     
     logger.info("API keys saved to session")
+    flush_logger(logger)
     return "✅ Configuration saved successfully!"
 
-def search_and_summarize(query: str, news_key: str, groq_key: str, gnews_key: str = ""):
+def search_and_summarize(query: str, news_key: str, groq_key: str, gnews_key: str = "", progress=gr.Progress()):
     # Validate query
     valid, processed_query = validate_query(query)
     if not valid:
-        return processed_query, pd.DataFrame(), f"❌ {processed_query}"
+        yield processed_query, pd.DataFrame(), f"❌ {processed_query}"
+        return
     
     # Use provided keys or fallback to session store
     news_api_key = news_key or api_keys_store.get("news")
@@ -38,29 +40,43 @@ def search_and_summarize(query: str, news_key: str, groq_key: str, gnews_key: st
     
     # verify API keys
     if not news_api_key or not groq_api_key:
-        return (
+        yield (
             "❌ Missing API keys. Please configure in Settings tab.",
             pd.DataFrame(),
             "❌ Configuration incomplete"
         )
+        return
     
     logger.info(f"Processing query: {processed_query}")
     
-    result = execute_agent(
-        processed_query,
-        news_api_key,
-        groq_api_key,
-        gnews_api_key,
-        logger=logger
-    )
-    
-    if result["success"]:
-        status = f"✅ Done in {result['processing_time']:.2f}s"
-    else:
-        status = f"❌ Error: {result['summary']}"
-
-    sources = result.get("sources", pd.DataFrame())
-    return result["summary"], sources, status
+    try:
+        for result in stream_agent(
+            processed_query,
+            news_api_key,
+            groq_api_key,
+            gnews_api_key,
+            logger=logger
+        ):
+            # Report each finished step, then stream the summary as the LLM generates it
+            if "step" in result:
+                completed = AGENT_STEPS.index(result["step"]) + 1
+                progress(completed / len(AGENT_STEPS), desc=f"{result['step'].title()} done")
+                continue
+            
+            if not result["done"]:
+                yield result["summary"], pd.DataFrame(), "⏳ Summarizing..."
+                continue
+            
+            if result["success"]:
+                status = f"✅ Done in {result['processing_time']:.2f}s"
+            else:
+                status = f"❌ Error: {result['summary']}"
+            
+            sources = result.get("sources", pd.DataFrame())
+            yield result["summary"], sources, status
+    finally:
+        # Logs are buffered; write this request's lines out now that it's finished
+        flush_logger(logger)
 
 def export_summary(summary_md: str, sources_df):
     try:
@@ -92,6 +108,9 @@ def export_summary(summary_md: str, sources_df):
     except Exception as e:
         logger.error(f"Export failed: {e}")
         return None
+    
+    finally:
+        flush_logger(logger)
 
 with gr.Blocks(
     title="📰 News Aggregator with LangGraph",
@@ -113,7 +132,7 @@ with gr.Blocks(
                 label="What news topic interests you?",
                 placeholder="e.g., AI regulations, climate change, tech news, quantum computing",
                 lines=2,
-                max_length=200
+                max_length=MAX_QUERY_LEN
             )
             
             search_btn = gr.Button(
@@ -190,7 +209,8 @@ with gr.Blocks(
     search_btn.click(
         fn=search_and_summarize,
         inputs=[query_input, news_key_input, groq_key_input, gnews_key_input],
-        outputs=[summary_output, sources_output, search_status]
+        outputs=[summary_output, sources_output, search_status],
+        queue=True
     )
     
     save_btn.click(
@@ -205,8 +225,12 @@ with gr.Blocks(
         outputs=[file_output]
     )
 
+# Queue runs requests on worker threads so concurrent users don't serialize
+demo.queue(default_concurrency_limit=4, max_size=32)
+
 if __name__ == "__main__":
     logger.info("Starting News Aggregator App with LangGraph")
+    flush_logger(logger)
     demo.launch(
         server_port=GRADIO_PORT,
         share=GRADIO_SHARE,
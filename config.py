@@ -1,28 +1,39 @@
+import logging as _logging
+from typing import Final, cast
+
 # API Endpoints
-NEWS_API_BASE = "https://newsapi.org/v2"
-GNEWS_API_BASE = "https://gnews.io/api/v4"
-GROQ_API_BASE = "https://api.groq.com/openai/v1"
+NEWS_API_BASE: Final[str] = "https://newsapi.org/v2"
+GNEWS_API_BASE: Final[str] = "https://gnews.io/api/v4"
+GROQ_API_BASE: Final[str] = "https://api.groq.com/openai/v1"
 
 # Agent Parameters
-MAX_RESULTS = 5
-MAX_SUMMARY_LENGTH = 500
-SEARCH_QUERY_VARIANTS = 3
+MAX_RESULTS: Final[int] = 5
+MAX_SUMMARY_LENGTH: Final[int] = 500
+SEARCH_QUERY_VARIANTS: Final[int] = 3
+MAX_CONTENT_CHARS: Final[int] = 2000  # Article text carried past analysis per article
+MAX_FETCHES_PER_HOST: Final[int] = 2
+
+# Query Validation
+MIN_QUERY_LEN: Final[int] = 3
+MAX_QUERY_LEN: Final[int] = 200
 
 # Timeouts (seconds)
-SEARCH_TIMEOUT = 5
-EXTRACT_TIMEOUT = 10
-SUMMARIZE_TIMEOUT = 6
+SEARCH_TIMEOUT: Final[int] = 5
+EXTRACT_TIMEOUT: Final[int] = 10
+EXTRACT_CONNECT_TIMEOUT: Final[int] = 3
+SUMMARIZE_TIMEOUT: Final[int] = 6
 
 # UI Configuration
-GRADIO_THEME = "soft"
-GRADIO_PORT = 7860
-GRADIO_SHARE = False
+GRADIO_THEME: Final[str] = "soft"
+GRADIO_PORT: Final[int] = 7860
+GRADIO_SHARE: Final[bool] = False
 
 # LLM Configuration
-GROQ_MODEL = "mixtral-8x7b-32768"
-LLM_MAX_TOKENS = 1200
-LLM_TEMPERATURE = 0.7
+GROQ_MODEL: Final[str] = "mixtral-8x7b-32768"
+LLM_MAX_TOKENS: Final[int] = 1200
+LLM_TEMPERATURE: Final[float] = 0.7
 
 # Logging
-LOG_LEVEL = "INFO"
-ENABLE_AGENT_LOGGING = True
+LOG_LEVEL: Final[str] = "INFO"
+LOG_LEVEL_NUM: Final[int] = cast(int, _logging.getLevelName(LOG_LEVEL))
+ENABLE_AGENT_LOGGING: Final[bool] = True
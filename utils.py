@@ -1,40 +1,140 @@
+import importlib.util
 import os
-from dotenv import find_dotenv, load_dotenv
+import threading
+from functools import lru_cache
+from dotenv import dotenv_values, find_dotenv, load_dotenv
 import logging
-from config import LOG_LEVEL
+import logging.handlers
+from typing import Callable, Final
+from config import LOG_LEVEL_NUM, MIN_QUERY_LEN, MAX_QUERY_LEN
 
-def get_api_keys():
-    dotenv_path = find_dotenv()
-    load_dotenv(dotenv_path)
-    news_key = os.getenv("NEWS_API_KEY")
-    groq_key = os.getenv("GROQ_API_KEY")
-    gnews_key = os.getenv("GNEWS_API_KEY")
+_FORMATTER: Final[logging.Formatter] = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+_API_KEY_VARS: Final[tuple[str, ...]] = ("NEWS_API_KEY", "GROQ_API_KEY", "GNEWS_API_KEY")
+
+# Resolved once at import so key loading never re-walks the directory tree
+_DOTENV_PATH: Final[str] = find_dotenv()
+
+# Written next to this module, which is the script directory `import env_snapshot` searches
+_SNAPSHOT_PATH: Final[str] = os.path.join(os.path.dirname(os.path.abspath(__file__)), "env_snapshot.py")
+
+# Keys tuple, loaded once by whichever caller gets there first
+_keys: tuple[str | None, ...] = ()
+_keys_loaded = threading.Event()
+_keys_lock = threading.Lock()
+
+def _load_keys() -> dict[str, str | None]:
+    """Read API keys, preferring a prebuilt env_snapshot module over parsing .env"""
+    log = logging.getLogger(__name__)
+    snapshot: dict[str, str] = {}
+    spec = importlib.util.find_spec("env_snapshot")
+    snapshot_path = spec.origin if spec and spec.origin else ""
     
-    return news_key, groq_key, gnews_key
+    # A .env edited after the snapshot was written means the snapshot holds stale keys
+    if snapshot_path and _DOTENV_PATH and os.path.getmtime(_DOTENV_PATH) > os.path.getmtime(snapshot_path):
+        log.warning("%s is older than %s; loading keys from .env (rerun `python utils.py`)", snapshot_path, _DOTENV_PATH)
+        snapshot_path = ""
+    
+    if snapshot_path:
+        from env_snapshot import ENV  # type: ignore[import-not-found]
+        snapshot = ENV
+        log.info("API keys loaded from %s", snapshot_path)
+    elif _DOTENV_PATH:
+        load_dotenv(_DOTENV_PATH, override=False)
+        log.info("API keys loaded from %s", _DOTENV_PATH)
+    else:
+        # No .env found means keys come from the real environment only
+        log.info("API keys loaded from the environment")
+    
+    # Real environment variables win, matching load_dotenv(override=False)
+    return {k: os.environ.get(k, snapshot.get(k)) for k in _API_KEY_VARS}
 
-def validate_query(query: str):
-    query = query.strip() if query else ""
+def write_env_snapshot(path: str = _SNAPSHOT_PATH) -> str:
+    """Compile .env into an importable module so startup skips dotenv parsing"""
+    values = dotenv_values(_DOTENV_PATH) if _DOTENV_PATH else {}
+    env = {k: values.get(k) for k in _API_KEY_VARS if values.get(k) is not None}
     
-    if not query:
-        return False, "❌ Please enter a news topic"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Generated by utils.write_env_snapshot; do not commit\n")
+        f.write(f"ENV = {env!r}\n")
+    
+    return path
+
+def get_api_keys() -> tuple[str | None, ...]:
+    global _keys
     
-    if len(query) < 3:
-        return False, "❌ Topic too short (minimum 3 characters)"
+    # Fast path is a single Event check; the lock only guards the first load
+    if _keys_loaded.is_set():
+        return _keys
     
-    if len(query) > 200:
-        return False, "❌ Topic too long (maximum 200 characters)"
+    with _keys_lock:
+        if not _keys_loaded.is_set():
+            keys = _load_keys()
+            _keys = (keys["NEWS_API_KEY"], keys["GROQ_API_KEY"], keys["GNEWS_API_KEY"])
+            _keys_loaded.set()
     
-    return True, query
+    return _keys
 
-def setup_logger(name: str):
+# Precomputed validation failures (shared, so callers may compare by identity)
+_ERR_EMPTY: Final[tuple[bool, str]] = (False, "❌ Please enter a news topic")
+_ERR_SHORT: Final[tuple[bool, str]] = (False, f"❌ Topic too short (minimum {MIN_QUERY_LEN} characters)")
+_ERR_LONG: Final[tuple[bool, str]] = (False, f"❌ Topic too long (maximum {MAX_QUERY_LEN} characters)")
+
+@lru_cache(maxsize=256)
+def validate_query(query: str | None) -> tuple[bool, str]:
+    q = (query or "").strip()
+    n = len(q)
+    
+    if n == 0:
+        return _ERR_EMPTY
+    if n < MIN_QUERY_LEN:
+        return _ERR_SHORT
+    if n > MAX_QUERY_LEN:
+        return _ERR_LONG
+    
+    return True, q
+
+def setup_logger(
+    name: str,
+    _level: int = LOG_LEVEL_NUM,
+    _fmt: logging.Formatter = _FORMATTER
+) -> logging.Logger:
+    # Defaults bind the config level and shared formatter as fast locals
     logger = logging.getLogger(name)
-    logger.setLevel(LOG_LEVEL)
     
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    # Only configure once; repeat calls would stack duplicate handlers
+    if not logger.handlers:
+        target = logging.StreamHandler()
+        target.setFormatter(_fmt)
+        
+        # Buffer records and write them in batches; errors (and shutdown) flush immediately
+        handler = logging.handlers.MemoryHandler(
+            capacity=64,
+            flushLevel=logging.ERROR,
+            target=target,
+            flushOnClose=True
+        )
+        logger.addHandler(handler)
+        logger.setLevel(_level)
+        logger.propagate = False
     
     return logger
+
+def flush_logger(logger: logging.Logger) -> None:
+    """Write out any records buffered by the logger's handlers (call at request boundaries)"""
+    for handler in logger.handlers:
+        handler.flush()
+
+def debug(logger: logging.Logger | None, message_fn: Callable[[], str]) -> None:
+    """
+    Log a lazily built DEBUG message
+    
+    message_fn is only called when the logger is enabled for DEBUG, so
+    expensive messages (e.g. built from article bodies) cost nothing otherwise.
+    For one-off checks use logger.isEnabledFor(logging.DEBUG) directly.
+    """
+    if logger and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(message_fn())
+
+if __name__ == "__main__":
+    print(f"Wrote {write_env_snapshot()}")